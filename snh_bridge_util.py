@@ -2,18 +2,130 @@
 # It is used to test the API and to ensure that it is working as expected
 # It is also used to exercise the API for development purposes
 
-import requests
+# requests, requests_toolbelt, configparser and concurrent.futures are
+# imported where they're used so `configure` and `--help` start quickly
 import json
 import argparse
+import functools
+import hashlib
+import logging
 import sys
 import os
-from pathlib import Path
-from configparser import ConfigParser
+import threading
+import time
+from urllib.parse import urljoin
+
+# orjson is optional; it encodes and decodes JSON noticeably faster
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj, allow_nan=False).encode('utf-8')
 
 BASE_URL = "https://vector-knowledge-base-RichBodo.replit.app"
 
+# Records files already uploaded by batch mode so unchanged files can be skipped
+UPLOAD_CACHE_FILE = os.path.expanduser('~/.snh_bridge/uploaded.json')
+
+# Set SNH_BRIDGE_DEBUG (or pass --debug) to log request debugging details
+DEBUG = os.getenv('SNH_BRIDGE_DEBUG', '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+# Upload progress and errors; the handler and level are set up in main()
+log = logging.getLogger('snh_bridge')
+
+# (connect, read) timeout in seconds for uploads; the server may take a
+# while to process a large PDF before it responds
+UPLOAD_TIMEOUT = (10, 300)
+
+# Most 307/308 redirects an upload will follow by re-sending the file
+MAX_UPLOAD_REDIRECTS = 5
+
+# Transient failures are retried this many times with exponential backoff
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Parallel uploads used by batch mode unless SNH_BRIDGE_CONCURRENCY is set
+DEFAULT_MAX_WORKERS = 4
+
+def get_max_workers():
+    """Get the batch upload concurrency from SNH_BRIDGE_CONCURRENCY."""
+    value = os.getenv('SNH_BRIDGE_CONCURRENCY', str(DEFAULT_MAX_WORKERS))
+    try:
+        max_workers = int(value)
+    except ValueError:
+        max_workers = 0
+    if max_workers < 1:
+        raise ValueError(f"invalid SNH_BRIDGE_CONCURRENCY: {value} (must be a positive integer)")
+    return max_workers
+
+# Shared session so every request reuses pooled keep-alive connections
+_SESSION = None
+
+def _session():
+    """Get the module-level requests session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        # Size the pool for batch mode's workers; a bad setting is reported there
+        try:
+            pool_maxsize = max(32, get_max_workers())
+        except ValueError:
+            pool_maxsize = 32
+        
+        class StreamAwareAdapter(HTTPAdapter):
+            """Route streamed request bodies to an adapter that won't resend them.
+            
+            urllib3 can't rewind a streamed body such as a MultipartEncoder, so
+            those requests only retry failures that happen before anything has
+            been sent; _upload_pdf retries error statuses itself.
+            """
+            def __init__(self, stream_retries, **kwargs):
+                super().__init__(**kwargs)
+                self.stream_adapter = HTTPAdapter(**dict(kwargs, max_retries=stream_retries))
+            
+            def send(self, request, **kwargs):
+                if request.body is None or isinstance(request.body, (bytes, str)):
+                    return super().send(request, **kwargs)
+                return self.stream_adapter.send(request, **kwargs)
+            
+            def close(self):
+                super().close()
+                self.stream_adapter.close()
+        
+        # Retry transient failures with backoff on the pooled connections
+        retry = Retry(
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'POST']),
+            raise_on_status=False,  # hand the last response to the normal error handling
+        )
+        stream_retry = Retry(
+            total=RETRY_TOTAL,
+            connect=RETRY_TOTAL,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=RETRY_BACKOFF,
+        )
+        _SESSION = requests.Session()
+        _SESSION.mount('https://', StreamAwareAdapter(stream_retry, pool_connections=4,
+                                                      pool_maxsize=pool_maxsize,
+                                                      max_retries=retry))
+    return _SESSION
+
+@functools.lru_cache(maxsize=1)
 def get_api_key():
-    """Get API key from environment variable or config file."""
+    """Get API key from environment variable or config file (cached)."""
     # First, check environment variable
     api_key = os.getenv('SNH_BRIDGE_API_KEY')
     if api_key:
@@ -21,14 +133,35 @@ def get_api_key():
 
     # Next, check for config file
     config_file = os.path.expanduser('~/.snh_bridge/config.ini')
-    if os.path.exists(config_file):
-        config = ConfigParser()
-        config.read(config_file)
-        try:
-            return config['auth']['api_key']
-        except (KeyError, ValueError):
-            pass
+    try:
+        return _read_api_key(config_file)
+    except OSError:
+        return None
 
+def _read_api_key(config_file):
+    """Read api_key from the [auth] section of the config file.
+    
+    A minimal reader for the file setup_api_key writes; ConfigParser is
+    only needed on the write path.
+    """
+    section = None
+    with open(config_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] in '#;':
+                continue
+            if line[0] == '[' and line[-1] == ']':
+                section = line[1:-1].strip()
+                continue
+            if section != 'auth':
+                continue
+            # Like ConfigParser, split on whichever delimiter comes first
+            positions = [i for i in (line.find('='), line.find(':')) if i != -1]
+            if not positions:
+                continue
+            split_at = min(positions)
+            if line[:split_at].strip().lower() == 'api_key':
+                return line[split_at + 1:].strip() or None
     return None
 
 def setup_api_key(api_key):
@@ -39,6 +172,16 @@ def setup_api_key(api_key):
     # Create config directory if it doesn't exist
     os.makedirs(config_dir, mode=0o700, exist_ok=True)
     
+    # Nothing to do if the file already holds this key
+    try:
+        if _read_api_key(config_file) == api_key:
+            print(f"API key unchanged in {config_file}")
+            return
+    except OSError:
+        pass
+    
+    from configparser import ConfigParser
+    
     config = ConfigParser()
     if os.path.exists(config_file):
         config.read(config_file)
@@ -48,15 +191,41 @@ def setup_api_key(api_key):
     
     config['auth']['api_key'] = api_key
     
-    # Save with restricted permissions
-    with open(config_file, 'w', encoding='utf-8') as f:
-        os.chmod(config_file, 0o600)
-        config.write(f)
+    # Write a restricted temp file and swap it in, so a crash can't
+    # leave a truncated or briefly world-readable config behind
+    tmp_file = f"{config_file}.tmp"
+    # Remove any leftover temp file so O_EXCL creates a fresh one with mode 0600
+    try:
+        os.unlink(tmp_file)
+    except FileNotFoundError:
+        pass
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            config.write(f)
+            # Make sure the data is on disk before the rename makes it live
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, config_file)
+    except BaseException:
+        # Don't leave a copy of the key behind in the temp file
+        try:
+            os.unlink(tmp_file)
+        except FileNotFoundError:
+            pass
+        raise
+    
+    # Drop any key cached from the previous configuration
+    get_api_key.cache_clear()
     
     print(f"API key saved to {config_file}")
 
-def get_headers(is_file_upload=False):
-    """Get headers including API key as Bearer token."""
+def _ensure_auth():
+    """Set the API key as a Bearer token on the shared session."""
+    session = _session()
+    if 'Authorization' in session.headers:
+        return session
+    
     api_key = get_api_key()
     if not api_key:
         raise ValueError(
@@ -65,128 +234,209 @@ def get_headers(is_file_upload=False):
             "2. Run: python snh_bridge_util.py configure --api-key YOUR_API_KEY"
         )
     
-    print(f"Debug: API key found (length: {len(api_key)})")
-    headers = {
-        'Authorization': f'Bearer {api_key}'  # Use Bearer token authentication
-    }
+    log.debug("API key found (length: %d)", len(api_key))
+    session.headers['Authorization'] = f'Bearer {api_key}'  # Use Bearer token authentication
+    return session
+
+def get_headers(is_file_upload=False):
+    """Get per-request headers; authentication lives on the shared session."""
+    headers = {}
     
     # Only add Content-Type for non-file uploads
     if not is_file_upload:
         headers['Content-Type'] = 'application/json'
     
-    print(f"Debug: Request headers: {headers}")
+    log.debug("Request headers: %s", headers)
     return headers
 
-def upload_pdf(file_path):
-    """Upload a PDF file to the API."""
-    print(f"\nSending POST request to: {BASE_URL}/api/upload")
+def _sha256_hexdigest(f):
+    """Hash an open binary file from its current position to the end."""
+    if hasattr(hashlib, 'file_digest'):
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+    # Python < 3.11
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: f.read(1 << 20), b''):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+def upload_pdf(file_path, file_stat=None):
+    """Upload a PDF file to the API.
     
-    if not Path(file_path).exists():
-        print(f"Error: File {file_path} does not exist")
-        return False
+    file_stat may be an os.stat result the caller already has for file_path.
+    Returns True on success and False otherwise. Progress and results go to
+    the 'snh_bridge' logger, which only has a handler when run through
+    main(); library callers need to configure logging to see them.
+    """
+    success, _ = _upload_pdf(file_path, file_stat)
+    return success
+
+def _upload_pdf(file_path, file_stat=None):
+    """Upload a PDF file and return (success, document_id).
+    
+    document_id is whatever the server returned for it and may be None.
+    """
+    import requests
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+    
+    if file_stat is None:
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
+            log.error("File %s does not exist", file_path)
+            return False, None
+        except OSError as e:
+            log.error("Cannot access %s: %s", file_path, e.strerror or e)
+            return False, None
         
-    print(f"\nStarting upload process for: {file_path}")
-    print(f"Target URL: {BASE_URL}/api/upload")
+    log.debug("Starting upload process for: %s", file_path)
+    log.debug("Target URL: %s/api/upload", BASE_URL)
     
     try:
-        print("Opening file...")
         with open(file_path, 'rb') as f:
             # Get file size for progress tracking
-            file_size = Path(file_path).stat().st_size
-            print(f"File size: {file_size} bytes")
+            file_size = file_stat.st_size
+            log.debug("File size: %d bytes", file_size)
             
-            # Create file tuple with filename
-            files = {
-                'file': (os.path.basename(file_path), f, 'application/pdf')
-            }
+            # Let the server recognize files it already has
+            file_hash = _sha256_hexdigest(f)
+            f.seek(0)
+            log.debug("SHA-256: %s", file_hash)
             
-            # Get headers but don't set Content-Type
+            session = _ensure_auth()
             headers = get_headers(is_file_upload=True)
-            print(f"Debug: Request headers: {headers}")
+            headers['X-File-SHA256'] = file_hash
             
-            print("File opened successfully. Initiating upload request...")
+            log.debug("File opened successfully. Initiating upload request...")
             
-            # Use a session to track redirects
-            session = requests.Session()
-            response = session.post(
-                f"{BASE_URL}/api/upload",
-                files=files,
-                headers=headers,
-                allow_redirects=False  # We'll handle redirects manually to track them
-            )
+            # The streamed body is one-shot, so neither requests nor urllib3 can
+            # replay it. Transient error statuses and 307/308 redirects re-POST
+            # here with a fresh encoder; other redirects become GETs that
+            # requests follows itself
+            url = f"{BASE_URL}/api/upload"
+            redirect_count = 0
+            retry_count = 0
+            while True:
+                f.seek(0)
+                # Stream the multipart body from the open file instead of buffering it
+                encoder = MultipartEncoder(fields={
+                    'file': (os.path.basename(file_path), f, 'application/pdf')
+                })
+                # Content-Type comes from the encoder so it carries the boundary
+                headers['Content-Type'] = encoder.content_type
+                response = session.post(
+                    url,
+                    data=encoder,
+                    headers=headers,
+                    allow_redirects=False,
+                    timeout=UPLOAD_TIMEOUT
+                )
+                if response.status_code in RETRY_STATUSES and retry_count < RETRY_TOTAL:
+                    delay = RETRY_BACKOFF * (2 ** retry_count)
+                    retry_count += 1
+                    log.warning("Upload of %s got HTTP %d; retrying in %.1fs (%d/%d)",
+                                file_path, response.status_code, delay, retry_count, RETRY_TOTAL)
+                    response.close()
+                    time.sleep(delay)
+                    continue
+                if response.status_code not in (307, 308):
+                    break
+                redirect_count += 1
+                next_url = urljoin(response.url, response.headers['Location'])
+                if redirect_count > MAX_UPLOAD_REDIRECTS:
+                    log.error("Upload redirected more than %d times; giving up at %s",
+                              MAX_UPLOAD_REDIRECTS, next_url)
+                    return False, None
+                # Only re-send the file (and Authorization) to the same server
+                if session.should_strip_auth(url, next_url):
+                    log.error("Upload was redirected to a different host (%s); not re-sending the file",
+                              next_url)
+                    return False, None
+                log.debug("Received HTTP %d redirect to: %s", response.status_code, next_url)
+                url = next_url
             
-            print(f"\nUpload completely sent off: {file_size} bytes")
+            log.debug("Upload completely sent off: %d bytes", file_size)
             
-            # Track any redirects
-            history = []
-            while response.status_code in [301, 302, 303, 307, 308]:
-                redirect_url = response.headers['Location']
-                print(f"Received HTTP {response.status_code} redirect to: {redirect_url}")
-                history.append(response)
-                response = session.get(redirect_url, allow_redirects=False)
+            if response.is_redirect:
+                redirect_count += 1
+                redirect_url = urljoin(response.url, response.headers['Location'])
+                log.debug("Received HTTP %d redirect to: %s", response.status_code, redirect_url)
+                # Don't hand the session's Bearer token to another host
+                redirect_headers = {'Authorization': None} if session.should_strip_auth(url, redirect_url) else None
+                response = session.get(redirect_url, headers=redirect_headers, timeout=UPLOAD_TIMEOUT)
+                redirect_count += len(response.history)
             
-            if history:
-                print(f"\nFollowed {len(history)} redirect(s) to final URL: {response.url}")
+            if redirect_count:
+                log.info("Followed %d redirect(s) to final URL: %s", redirect_count, response.url)
             
-            print(f"\nFinal response status code: {response.status_code}")
-            print(f"Response headers: {dict(response.headers)}")
-            print(f"Raw response content: {response.text}")
+            log.debug("Final response status code: %d", response.status_code)
+            
+            # Read the body once and reuse it for parsing and error reporting
+            body = response.content
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Response headers: %s", dict(response.headers))
+                log.debug("Raw response content: %s", body.decode('utf-8', errors='replace'))
             
             if response.status_code == 200:
                 try:
-                    result = response.json()
+                    result = _loads(body)
                     if result.get('success'):
-                        print("\nUpload successful!")
-                        print(f"Document ID: {result['document_id']}")
-                        print(f"Message: {result['message']}")
-                        print("\nMetadata:")
+                        document_id = result.get('document_id')
                         metadata = result.get('metadata', {})
-                        print(f"Filename: {metadata.get('filename')}")
-                        print(f"Size: {metadata.get('size')} bytes")
-                        print(f"Content Type: {metadata.get('content_type')}")
+                        log.info(
+                            "Upload successful: %s\n"
+                            "Document ID: %s\n"
+                            "Message: %s\n"
+                            "Metadata:\n"
+                            "Filename: %s\n"
+                            "Size: %s bytes\n"
+                            "Content Type: %s",
+                            file_path, document_id, result['message'], metadata.get('filename'),
+                            metadata.get('size'), metadata.get('content_type'))
                     else:
-                        print(f"\nError: {result.get('error', 'Unknown error')}")
-                        return False
-                except json.JSONDecodeError:
-                    print("\nWarning: Server returned 200 but response was not valid JSON")
-                    print(f"Response content type: {response.headers.get('content-type', 'not specified')}")
-                    print(f"Non-JSON response content: {response.text}")
-                    return False
-                return True
+                        log.error("Upload of %s failed: %s", file_path, result.get('error', 'Unknown error'))
+                        return False, None
+                except ValueError:
+                    log.warning(
+                        "Server returned 200 but response was not valid JSON\n"
+                        "Response content type: %s\n"
+                        "Non-JSON response content: %s",
+                        response.headers.get('content-type', 'not specified'),
+                        body.decode('utf-8', errors='replace'))
+                    return False, None
+                return True, document_id
             else:
-                print(f"\nError: Upload failed with status {response.status_code}")
                 try:
-                    error_response = response.json()
-                    print(f"Error: {error_response.get('error', 'Unknown error')}")
-                except json.JSONDecodeError:
-                    print(f"Response content: {response.text}")
-                return False
+                    error_message = _loads(body).get('error', 'Unknown error')
+                except ValueError:
+                    error_message = f"Response content: {body.decode('utf-8', errors='replace')}"
+                log.error("Upload of %s failed with status %d: %s", file_path, response.status_code, error_message)
+                return False, None
             
     except requests.exceptions.ConnectionError as e:
-        print(f"\nConnection Error: Could not reach server at {BASE_URL}")
-        print(f"Details: {str(e)}")
-        return False
+        log.error("Could not reach server at %s: %s", BASE_URL, e)
+        return False, None
     except requests.exceptions.RequestException as e:
-        print(f"\nRequest Error: {str(e)}")
-        print(f"Response content (if available): {getattr(e.response, 'text', 'No response content')}")
-        return False
+        log.error("Request failed: %s\nResponse content (if available): %s",
+                  e, getattr(e.response, 'text', 'No response content'))
+        return False, None
     except Exception as e:
-        print(f"\nUnexpected Error: {str(e)}")
-        print(f"Error type: {type(e).__name__}")
-        return False
+        log.error("Unexpected %s: %s", type(e).__name__, e)
+        return False, None
 
 def query_documents(query_text):
     """Query the documents using semantic search."""
     try:
+        session = _ensure_auth()
         headers = get_headers()
         data = {'query': query_text}
         
-        response = requests.post(f"{BASE_URL}/api/query", 
-                               headers=headers,
-                               json=data)
+        # Send pre-serialized bytes; get_headers() already sets the JSON Content-Type
+        response = session.post(f"{BASE_URL}/api/query", 
+                                headers=headers,
+                                data=_dumps(data))
                                
         if response.status_code == 200:
-            results = response.json().get('results', [])
+            results = _loads(response.content).get('results', [])
             if not results:
                 print("\nNo relevant matches found")
                 return
@@ -206,9 +456,9 @@ def query_documents(query_text):
                 print(f"  File Size: {metadata.get('file_size')}")
         else:
             try:
-                error_response = response.json()
+                error_response = _loads(response.content)
                 print(f"Error: {error_response.get('error', 'Unknown error')}")
-            except json.JSONDecodeError:
+            except ValueError:
                 print(f"Error: Unexpected response format")
                 print(f"Response content: {response.text}")
             
@@ -216,58 +466,177 @@ def query_documents(query_text):
         print(f"Error querying documents: {str(e)}")
 
 def find_pdf_files(directory):
-    """Recursively find all PDF files in directory and its subdirectories."""
-    pdf_files = []
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.lower().endswith('.pdf'):
-                # Store full path and relative path for better reporting
-                full_path = os.path.join(root, file)
-                rel_path = os.path.relpath(full_path, directory)
-                pdf_files.append((full_path, rel_path))
-    return pdf_files
-
-def batch_upload(directory):
-    """Upload all PDF files from a directory and its subdirectories."""
+    """Recursively yield the paths of all PDF files in directory and its subdirectories."""
+    pending = [directory]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    # Don't descend into symlinked directories, same as os.walk
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name[-4:].lower() == '.pdf' and entry.is_file():
+                        yield entry.path
+        except OSError:
+            # Skip unreadable directories, as os.walk does by default
+            continue
+
+def _upload_cache_scope():
+    """Identify the server and API key that cached uploads belong to."""
+    api_key = get_api_key() or ''
+    key_fingerprint = hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+    return f"{BASE_URL} {key_fingerprint}"
+
+def _load_upload_cache():
+    """Load the batch upload cache, starting empty if it is missing or unreadable."""
+    try:
+        with open(UPLOAD_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def _save_upload_cache(scope, entries):
+    """Atomically store the entries for one scope in the batch upload cache.
+    
+    The file is re-read first so entries written meanwhile by another run
+    for a different scope are kept.
+    """
+    import tempfile
+    
+    cache = _load_upload_cache()
+    cache[scope] = entries
+    cache_dir = os.path.dirname(UPLOAD_CACHE_FILE)
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    # A unique temp file so concurrent runs can't swap in each other's partial writes
+    fd, tmp_file = tempfile.mkstemp(dir=cache_dir, prefix='.uploaded-', suffix='.json.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, UPLOAD_CACHE_FILE)
+    except BaseException:
+        try:
+            os.unlink(tmp_file)
+        except FileNotFoundError:
+            pass
+        raise
+
+def batch_upload(directory, force=False, max_workers=None):
+    """Upload all PDF files from a directory and its subdirectories.
+    
+    Files whose size and modification time match their last successful
+    upload are skipped unless force is set. max_workers defaults to
+    SNH_BRIDGE_CONCURRENCY (or 4).
+    """
+    if max_workers is None:
+        max_workers = get_max_workers()
+    
     if not os.path.isdir(directory):
         print(f"\nError: {directory} is not a valid directory")
         return False
         
-    pdf_files = find_pdf_files(directory)
+    pdf_files = list(find_pdf_files(directory))
     
     if not pdf_files:
         print(f"\nNo PDF files found in {directory} or its subdirectories")
         return False
         
-    print(f"\nFound {len(pdf_files)} PDF files to upload")
+    print(f"\nFound {len(pdf_files)} PDF files")
+    
+    # Resolve credentials up front; cached uploads are tied to the API key
+    _ensure_auth()
+    
+    # Skip files that haven't changed since they were last uploaded to this
+    # server with this API key
+    cache_scope = _upload_cache_scope()
+    upload_cache = _load_upload_cache().get(cache_scope)
+    if not isinstance(upload_cache, dict):
+        upload_cache = {}
+    pending_files = []
+    skipped_count = 0
+    for full_path in pdf_files:
+        abs_path = os.path.abspath(full_path)
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            st = None
+        cached = upload_cache.get(abs_path)
+        if (not force and st is not None and cached
+                and cached.get('size') == st.st_size
+                and cached.get('mtime_ns') == st.st_mtime_ns):
+            skipped_count += 1
+        else:
+            pending_files.append((full_path, abs_path, st))
+    
+    if skipped_count:
+        print(f"Skipping {skipped_count} file(s) unchanged since their last upload "
+              f"(use --force to upload them again)")
+    
+    if not pending_files:
+        print("\nNothing to upload")
+        return True
+    
     print("\nFiles to process:")
-    for _, rel_path in pdf_files:
-        print(f"  {rel_path}")
+    for full_path, _, _ in pending_files:
+        print(f"  {os.path.relpath(full_path, directory)}")
     
-    if len(pdf_files) > 10:
-        confirm = input(f"\nAre you sure you want to upload {len(pdf_files)} files? [y/N] ").lower()
+    if len(pending_files) > 10:
+        confirm = input(f"\nAre you sure you want to upload {len(pending_files)} files? [y/N] ").lower()
         if confirm != 'y':
             print("Upload cancelled")
             return False
     
-    success_count = 0
+    success_count = skipped_count
     failed_files = []
+    results_lock = threading.Lock()
     
-    for full_path, rel_path in pdf_files:
-        print(f"\nUploading {rel_path}...")
-        
-        if upload_pdf(full_path):
-            success_count += 1
-        else:
-            failed_files.append(rel_path)
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    
+    def upload_one(full_path, abs_path, st):
+        nonlocal success_count
+        log.info("Uploading %s...", os.path.relpath(full_path, directory))
+        success, document_id = _upload_pdf(full_path, st)
+        with results_lock:
+            if success:
+                success_count += 1
+                if st is not None:
+                    upload_cache[abs_path] = {
+                        'size': st.st_size,
+                        'mtime_ns': st.st_mtime_ns,
+                        'document_id': document_id,
+                    }
+            else:
+                failed_files.append(full_path)
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [executor.submit(upload_one, *pending)
+                   for pending in pending_files]
+        for future in as_completed(futures):
+            future.result()
+    except KeyboardInterrupt:
+        # Drop queued uploads; only the ones already running get to finish
+        print("\nInterrupted, waiting for uploads in progress to finish...")
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        executor.shutdown(wait=True)
+        # Keep whatever succeeded, even if the batch was interrupted
+        try:
+            _save_upload_cache(cache_scope, upload_cache)
+        except OSError as e:
+            print(f"\nWarning: Could not save upload cache: {str(e)}")
             
     print(f"\nUpload Summary:")
     print(f"Successfully uploaded: {success_count}/{len(pdf_files)} files")
+    if skipped_count:
+        print(f"Skipped as unchanged: {skipped_count}")
     
     if failed_files:
         print("\nFailed uploads:")
         for failed_file in failed_files:
-            print(f"- {failed_file}")
+            print(f"- {os.path.relpath(failed_file, directory)}")
     
     return success_count == len(pdf_files)
 
@@ -290,6 +659,9 @@ Examples:
     python snh_bridge_util.py query "your search query here"
 """)
     
+    parser.add_argument('--debug', action='store_true', default=DEBUG,
+                        help='Log request debugging details, including urllib3 connection activity')
+    
     # Create subparsers for different commands
     subparsers = parser.add_subparsers(dest='command', required=True, help='Commands')
     
@@ -304,6 +676,8 @@ Examples:
     # Batch upload command
     batch_parser = subparsers.add_parser('batch', help='Upload all PDFs in a directory')
     batch_parser.add_argument('directory', help='Directory containing PDF files')
+    batch_parser.add_argument('--force', action='store_true',
+                              help='Re-upload files even if unchanged since their last upload')
     
     # Query command
     query_parser = subparsers.add_parser('query', help='Search through documents')
@@ -311,19 +685,35 @@ Examples:
     
     args = parser.parse_args()
     
+    # A single handler keeps log records from parallel uploads whole
+    level_name = 'DEBUG' if args.debug else os.getenv('SNH_BRIDGE_LOG', 'INFO').upper()
+    level = logging.getLevelName(level_name)
+    if not isinstance(level, int):
+        parser.error(f"invalid SNH_BRIDGE_LOG level: {level_name}")
+    
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    log.addHandler(handler)
+    log.setLevel(level)
+    if args.debug:
+        urllib3_log = logging.getLogger('urllib3')
+        urllib3_log.addHandler(handler)
+        urllib3_log.setLevel(logging.DEBUG)
+    
     try:
         if args.command == 'configure':
             setup_api_key(args.api_key)
         elif args.command == 'upload':
-            if not os.path.exists(args.file):
-                print(f"Error: File not found: {args.file}")
+            if not upload_pdf(args.file):
                 sys.exit(1)
-            upload_pdf(args.file)
         elif args.command == 'batch':
-            if not os.path.exists(args.directory):
-                print(f"Error: Directory not found: {args.directory}")
+            # Only batch mode uses the concurrency setting, so only it checks it
+            try:
+                max_workers = get_max_workers()
+            except ValueError as e:
+                parser.error(str(e))
+            if not batch_upload(args.directory, force=args.force, max_workers=max_workers):
                 sys.exit(1)
-            batch_upload(args.directory)
         elif args.command == 'query':
             query_documents(args.text)
         else: